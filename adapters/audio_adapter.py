@@ -1,5 +1,34 @@
+import os
+import json
+
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
+from torch.nn.utils.fusion import fuse_conv_bn_eval
+
+
+def _tap_pool(f: torch.Tensor) -> torch.Tensor:
+    """
+    Early-exit tap pooling: max over time T, then mean over mel bins M.
+
+    (B, C, M, T) -> (B, C)
+
+    Written as adaptive max-pool (T -> 1) + adaptive avg-pool (M -> 1): on
+    the channels_last activations these use NHWC pooling kernels, whereas
+    amax(-1) on an NHWC tensor reduces over a strided axis and is several
+    times slower. The legacy ONNX exporter cannot export adaptive pooling
+    with a dynamic T, so export uses the equivalent amax/mean form.
+    """
+    if not torch.jit.is_scripting():
+        if torch.onnx.is_in_onnx_export():
+            return f.amax(dim=-1).mean(dim=-1)
+    f = F.adaptive_max_pool2d(f, (f.shape[2], 1))
+    return F.adaptive_avg_pool2d(f, 1).flatten(1)
+
+
+# Keep _tap_pool as a single leaf call under torch.fx tracing (used by the
+# FX quantization flow), so it stays in float between the quantized blocks.
+torch.fx.wrap("_tap_pool")
 
 
 class TinyAudioCNN(nn.Module):
@@ -34,7 +63,7 @@ class TinyAudioCNN(nn.Module):
         - Keeps the rest of the system agnostic to raw spectrogram details.
     """
 
-    def __init__(self, n_mels: int = 64):
+    def __init__(self, n_mels: int = 64, strided_blocks=()):
         """
         Args:
             n_mels (int):
@@ -42,8 +71,33 @@ class TinyAudioCNN(nn.Module):
                 This parameter is not explicitly used in the layers
                 (since conv/pool are spatially generic), but documents
                 the expected input format and can be useful for sanity checks.
+            strided_blocks (iterable of int):
+                Blocks (1 and/or 2) that downsample with a stride-2 conv
+                instead of conv + MaxPool2d. Saves the pooling pass over the
+                activation map but changes the receptive field, so weights
+                are NOT interchangeable with the default model. Default ()
+                keeps the original conv + max-pool blocks.
         """
         super().__init__()
+        self.n_mels = int(n_mels)
+        self.strided_blocks = tuple(int(b) for b in strided_blocks)
+        if not set(self.strided_blocks) <= {1, 2}:
+            raise ValueError(
+                f"strided_blocks may only contain 1 and 2, got {list(self.strided_blocks)}"
+            )
+
+        def down_block(in_ch, out_ch, block_idx):
+            # conv + BN + ReLU, downsampled x2 either by max-pool or by conv stride
+            strided = block_idx in self.strided_blocks
+            layers = [
+                nn.Conv2d(in_channels=in_ch, out_channels=out_ch, kernel_size=3, padding=1,
+                          stride=2 if strided else 1),
+                nn.BatchNorm2d(out_ch),
+                nn.ReLU(),
+            ]
+            if not strided:
+                layers.append(nn.MaxPool2d(kernel_size=(2, 2)))
+            return nn.Sequential(*layers)
 
         # -------------------------
         # Block 1: (1 -> 16 channels)
@@ -51,30 +105,22 @@ class TinyAudioCNN(nn.Module):
         # - Conv2d: learns local time-frequency patterns from log-mel input.
         # - BatchNorm2d: stabilizes training and normalizes feature maps.
         # - ReLU: introduces non-linearity.
-        # - MaxPool2d: reduces resolution by a factor of 2 in both M and T.
+        # - MaxPool2d: reduces resolution by a factor of 2 in both M and T
+        #   (or the conv itself uses stride 2 if 1 in strided_blocks).
         #
         # Input:  (B,  1, M,   T)
         # Output: (B, 16, M/2, T/2)
-        self.block1 = nn.Sequential(
-            nn.Conv2d(in_channels=1, out_channels=16, kernel_size=3, padding=1),
-            nn.BatchNorm2d(16),
-            nn.ReLU(),
-            nn.MaxPool2d(kernel_size=(2, 2)),
-        )
+        self.block1 = down_block(1, 16, 1)
 
         # -------------------------
         # Block 2: (16 -> 32 channels)
         # -------------------------
-        # Same pattern: conv + batch-norm + ReLU + max-pooling.
+        # Same pattern: conv + batch-norm + ReLU + max-pooling
+        # (or stride-2 conv if 2 in strided_blocks).
         #
         # Input:  (B, 16, M/2,   T/2)
         # Output: (B, 32, M/4,   T/4)
-        self.block2 = nn.Sequential(
-            nn.Conv2d(in_channels=16, out_channels=32, kernel_size=3, padding=1),
-            nn.BatchNorm2d(32),
-            nn.ReLU(),
-            nn.MaxPool2d(kernel_size=(2, 2)),
-        )
+        self.block2 = down_block(16, 32, 2)
 
         # -------------------------
         # Block 3: (32 -> 64 channels)
@@ -93,6 +139,36 @@ class TinyAudioCNN(nn.Module):
             nn.AdaptiveAvgPool2d((1, 1)),
         )
 
+        # Keep conv weights in channels_last (NHWC) layout. oneDNN / cuDNN
+        # pick faster NHWC conv kernels on AVX CPUs and tensor-core GPUs.
+        # .to(device) and load_state_dict() preserve this layout.
+        self.to(memory_format=torch.channels_last)
+
+    # Architecture settings saved next to a run's checkpoint. Strided and
+    # pooled blocks have identical parameter shapes, so the state_dict alone
+    # cannot tell them apart.
+    CONFIG_NAME = "backbone.json"
+
+    def save_config(self, ckpt_dir):
+        """Write the constructor settings to <ckpt_dir>/backbone.json."""
+        cfg = {"n_mels": self.n_mels, "strided_blocks": list(self.strided_blocks)}
+        with open(os.path.join(ckpt_dir, self.CONFIG_NAME), "w") as f:
+            json.dump(cfg, f, indent=2)
+
+    @classmethod
+    def from_run_dir(cls, run_dir):
+        """
+        Build the backbone a run was trained with, from
+        <run_dir>/ckpt/backbone.json. Runs without that file predate the
+        option and use the default architecture.
+        """
+        path = os.path.join(run_dir, "ckpt", cls.CONFIG_NAME)
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r") as f:
+            cfg = json.load(f)
+        return cls(**cfg)
+
     def forward(self, x: torch.Tensor):
         """
         Forward pass through the TinyAudioCNN.
@@ -109,6 +185,9 @@ class TinyAudioCNN(nn.Module):
                 t2: (B, 32) intermediate feature vector (from block2)
         """
         # x: (B, 1, M, T)
+        # Match the channels_last layout of the conv weights (one copy at
+        # entry; all later activations stay NHWC).
+        x = x.contiguous(memory_format=torch.channels_last)
 
         # Pass through first conv block.
         # f1: (B, 16, M/2, T/2)
@@ -132,16 +211,17 @@ class TinyAudioCNN(nn.Module):
         #   1. torch.amax(..., dim=-1)  -> max over time dimension T
         #   2. .mean(-1)                -> mean over frequency dimension M
         #
-        # This gives a single summary value per channel.
+        # This gives a single summary value per channel. Both steps live in
+        # the _tap_pool helper (implemented with NHWC-friendly pooling ops).
 
         # From f1: (B,16,M/2,T/2)
         #   1. amax over last dim (T/2) -> (B,16,M/2)
         #   2. mean  over last dim (M/2) -> (B,16)
-        t1 = torch.amax(f1, dim=-1).mean(-1)  # (B, 16)
+        t1 = _tap_pool(f1)  # (B, 16)
 
         # From f2: (B,32,M/4,T/4)
         # Same pooling strategy.
-        t2 = torch.amax(f2, dim=-1).mean(-1)  # (B, 32)
+        t2 = _tap_pool(f2)  # (B, 32)
 
         # For the final deep feature, f3 is already (B,64,1,1),
         # so we just flatten the last two spatial dimensions.
@@ -150,3 +230,277 @@ class TinyAudioCNN(nn.Module):
         # final_feat: deep representation
         # taps: early-exit representations at shallower depths
         return t3, [t1, t2]
+
+    @torch.inference_mode()
+    def infer(self, x: torch.Tensor):
+        """
+        Inference entry point: forward() under torch.inference_mode().
+
+        Skips autograd graph construction and version-counter tracking for
+        every op (cheaper than torch.no_grad()). Call .eval() first so
+        BatchNorm uses its running statistics. The returned tensors are
+        inference tensors and cannot be used in autograd later.
+        """
+        return self.forward(x)
+
+    def compile_fast(self, dynamic: bool = False):
+        """
+        Build the torch.compile'd copy used by forward_fast().
+
+        Args:
+            dynamic (bool): Compile for varying input shapes (e.g. different
+                T). False is best for a fixed segment length. Calling this
+                again recompiles with the new setting.
+
+        Returns:
+            self
+        """
+        compiled = torch.compile(self, mode="reduce-overhead", fullgraph=True, dynamic=dynamic)
+        # Bypass nn.Module.__setattr__: as a registered submodule the
+        # wrapper would add duplicate "_compiled.*" keys to state_dict().
+        object.__setattr__(self, "_compiled", compiled)
+        return self
+
+    def forward_fast(self, x: torch.Tensor):
+        """
+        Same as forward(), but through a torch.compile'd copy of the module.
+
+        Inductor fuses the BN+ReLU pointwise chains and the tap reductions
+        into fewer kernels and picks the conv layouts. Set up with
+        compile_fast(dynamic=...) first; otherwise the first call compiles
+        with dynamic=False. Compilation happens on the first call (slow).
+
+        NOTE: mode="reduce-overhead" replays CUDA graphs on GPU, and the
+        returned tensors live in the graph's static memory: the next
+        forward_fast() call overwrites them. .clone() any output (t3 or
+        taps) that must survive across calls.
+        """
+        if self.__dict__.get("_compiled") is None:
+            self.compile_fast()
+        return self._compiled(x)
+
+    def __getstate__(self):
+        # The compiled wrapper refers back to this module, which breaks
+        # copy.deepcopy / pickling; copies recompile on first forward_fast().
+        state = super().__getstate__().copy()
+        state.pop("_compiled", None)
+        return state
+
+    def forward_batch(self, specs, max_batch: int = 64):
+        """
+        Run many individual clips through the backbone as a few large batches.
+
+        The network has no cross-sample state, so stacking clips is free and
+        avoids one small forward per clip. Clips are bucketed by length and
+        each bucket is stacked without padding (any padding value would leak
+        into the max/avg pooling, e.g. 0 is the loudest bin of
+        power_to_db(ref=max) features), so every row matches a per-clip
+        forward.
+
+        Args:
+            specs: list of spectrograms, each (1, M, T_i) or (M, T_i).
+                   T_i may differ between clips.
+            max_batch (int): Maximum number of clips per forward pass.
+
+        Returns:
+            final_feat: (N, 64) and taps [t1 (N, 16), t2 (N, 32)],
+            row i corresponding to specs[i].
+
+        Raises:
+            ValueError: if specs is empty.
+        """
+        specs = [s.reshape(1, -1, s.shape[-1]) for s in specs]  # (1, M, T_i)
+        if not specs:
+            raise ValueError("forward_batch() needs at least one spectrogram")
+
+        # Bucket clip indices by number of frames
+        buckets = {}
+        for i, s in enumerate(specs):
+            buckets.setdefault(s.shape[-1], []).append(i)
+
+        order, feats, taps1, taps2 = [], [], [], []
+        for idx in buckets.values():
+            for start in range(0, len(idx), max_batch):
+                chunk = idx[start:start + max_batch]
+                t3, (t1, t2) = self(torch.stack([specs[i] for i in chunk]))
+                order.extend(chunk)
+                feats.append(t3)
+                taps1.append(t1)
+                taps2.append(t2)
+
+        # Undo the bucketing: row i of the output belongs to specs[i]
+        inv = torch.empty(len(order), dtype=torch.long)
+        inv[torch.tensor(order, dtype=torch.long)] = torch.arange(len(order))
+        inv = inv.to(feats[0].device)
+        return (torch.cat(feats)[inv],
+                [torch.cat(taps1)[inv], torch.cat(taps2)[inv]])
+
+    def alloc_io(self, batch: int, n_mels: int, T_max: int, device="cuda"):
+        """
+        Pre-allocate reusable input buffers for GPU inference.
+
+        Creates two slots (double buffering), each with a pinned host buffer
+        and a device buffer big enough for (batch, 1, n_mels, T_max), plus a
+        side CUDA stream and one event per slot. stage_input() then does no
+        per-call allocation and overlaps the copy of the next batch with the
+        forward of the current one.
+
+        Slots are flat: a smaller (B, 1, M, T) batch is a contiguous view of
+        the first B*M*T elements, so forward() never has to re-layout it.
+
+        Returns:
+            self
+        """
+        numel = batch * n_mels * T_max
+        self._io_shape = (batch, n_mels, T_max)
+        self._pinned = [torch.empty(numel, pin_memory=True) for _ in range(2)]
+        self._dev_in = [torch.empty(numel, device=device) for _ in range(2)]
+        self._stream = torch.cuda.Stream(device=device)
+        # _released[k]: recorded after the last forward that read slot k
+        self._released = [torch.cuda.Event() for _ in range(2)]
+        self._slot = 0
+        return self
+
+    def stage_input(self, x):
+        """
+        Copy a host batch (B, 1, M, T) into the pre-allocated buffers
+        (see alloc_io) and return the device tensor to pass to forward().
+
+        x may be a numpy array or a CPU tensor with B <= batch, M == n_mels
+        and T <= T_max. The H2D copy runs asynchronously on the side stream;
+        the current stream waits for it before any later kernels, so the
+        result can be used directly. The returned tensor is overwritten two
+        calls later (double buffering).
+        """
+        x = torch.as_tensor(x)
+        batch, n_mels, T_max = self._io_shape
+        b, m, t = x.shape[0], x.shape[-2], x.shape[-1]
+        if b > batch or m != n_mels or t > T_max:
+            raise ValueError(
+                f"stage_input got {tuple(x.shape)}, buffers hold (<= {batch}, 1, {n_mels}, <= {T_max})"
+            )
+
+        slot = self._slot
+        self._slot = 1 - slot
+
+        # Everything enqueued so far includes the forward on the other slot's
+        # batch; that slot may be overwritten once this event has fired.
+        self._released[1 - slot].record(torch.cuda.current_stream())
+
+        # Make sure this slot is no longer read by an earlier forward / copy.
+        # (An event that was never recorded returns immediately.)
+        self._released[slot].synchronize()
+
+        n = b * m * t
+        host = self._pinned[slot][:n].view(b, 1, m, t)
+        host.copy_(x.reshape(b, 1, m, t))  # plain memcpy into page-locked memory
+
+        dev = self._dev_in[slot][:n].view(b, 1, m, t)
+        with torch.cuda.stream(self._stream):
+            dev.copy_(host, non_blocking=True)
+        torch.cuda.current_stream().wait_stream(self._stream)
+        return dev
+
+    def eval_fuse(self):
+        """
+        Fold each BatchNorm2d into the preceding Conv2d for inference.
+
+        With BN in eval mode it is just a per-channel affine transform, so it
+        can be absorbed into the conv weights/bias:
+            W' = W * gamma / sqrt(var + eps)
+            b' = (b - mean) * gamma / sqrt(var + eps) + beta
+
+        Each block becomes Conv2d -> ReLU -> Pool, which saves one full pass
+        over the activation maps per block. Outputs are unchanged (up to
+        float rounding).
+
+        Call this AFTER loading weights and calling .eval(); the fused model
+        has no BN layers, so it cannot be trained or load a regular
+        checkpoint afterwards.
+
+        Returns:
+            self (for chaining, e.g. model.backbone.eval().eval_fuse()).
+        """
+        if self.training:
+            raise RuntimeError("eval_fuse() requires eval mode; call .eval() first.")
+
+        for name in ("block1", "block2", "block3"):
+            block = getattr(self, name)
+            layers = list(block)
+            fused = []
+            i = 0
+            while i < len(layers):
+                layer = layers[i]
+                nxt = layers[i + 1] if i + 1 < len(layers) else None
+                if isinstance(layer, nn.Conv2d) and isinstance(nxt, nn.BatchNorm2d):
+                    # Conv2d + BatchNorm2d -> single Conv2d with folded weights
+                    fused.append(fuse_conv_bn_eval(layer, nxt))
+                    i += 2
+                else:
+                    fused.append(layer)
+                    i += 1
+            setattr(self, name, nn.Sequential(*fused))
+
+        # Fused convs are freshly built; restore the NHWC weight layout.
+        self.to(memory_format=torch.channels_last)
+
+        return self
+
+    def to_scripted(self):
+        """
+        Compile this backbone into a frozen TorchScript module for inference.
+
+        Steps:
+            1. torch.jit.script            -> graph without Python dispatch
+            2. torch.jit.freeze            -> weights / BN stats become constants
+            3. optimize_for_inference      -> Conv+BN(+ReLU) folding, etc.
+
+        The result has the same (final_feat, [t1, t2]) outputs and can
+        replace ExitNet.backbone. Build it once after loading weights and
+        keep the returned module; it does not track later weight changes.
+
+        Returns:
+            torch.jit.ScriptModule (frozen, eval mode).
+        """
+        m = torch.jit.script(self.eval())
+        m = torch.jit.freeze(m)
+        m = torch.jit.optimize_for_inference(m)
+        return m
+
+
+class OrtTinyAudioCNN(nn.Module):
+    """
+    OrtTinyAudioCNN
+    ---------------
+    Drop-in replacement for a trained TinyAudioCNN that runs an exported
+    ONNX graph (see scripts/export_audio_cnn.py) through ONNX Runtime.
+
+    Same call signature as TinyAudioCNN:
+        x: (B, 1, M, T) -> (final_feat (B, 64), [t1 (B, 16), t2 (B, 32)])
+
+    so it can be swapped into an ExitNet after the checkpoint is loaded:
+        model.backbone = OrtTinyAudioCNN("runs/<id>/ckpt/backbone.onnx")
+
+    Inference only: there are no trainable parameters.
+    """
+
+    def __init__(self, onnx_path: str, device: str = "cpu"):
+        """
+        Args:
+            onnx_path (str): Path to the exported backbone .onnx file.
+            device (str): "cpu" or "cuda". Selects the ORT execution provider.
+        """
+        super().__init__()
+        import onnxruntime as ort  # optional dependency, only needed here
+
+        providers = ["CPUExecutionProvider"]
+        if str(device).startswith("cuda"):
+            providers.insert(0, "CUDAExecutionProvider")
+        self.session = ort.InferenceSession(str(onnx_path), providers=providers)
+        self.input_name = self.session.get_inputs()[0].name
+
+    def forward(self, x: torch.Tensor):
+        x_np = x.detach().to("cpu", torch.float32).numpy()
+        t3, t1, t2 = self.session.run(None, {self.input_name: x_np})
+        out = [torch.from_numpy(t).to(x.device) for t in (t3, t1, t2)]
+        return out[0], [out[1], out[2]]
@@ -24,7 +24,8 @@ def make_loaders(segments_csv, features_root, batch_size=64, num_workers=4):
     ds_tr = LogMelDataset(segments_csv, features_root, 'train')
     ds_va = LogMelDataset(segments_csv, features_root, 'val')
     ds_te = LogMelDataset(segments_csv, features_root, 'test')
-    dl_tr = DataLoader(ds_tr, batch_size=batch_size, shuffle=True, num_workers=num_workers)
-    dl_va = DataLoader(ds_va, batch_size=batch_size, shuffle=False, num_workers=num_workers)
-    dl_te = DataLoader(ds_te, batch_size=batch_size, shuffle=False, num_workers=num_workers)
+    pin = torch.cuda.is_available()  # page-locked batches -> faster host-to-GPU copies
+    dl_tr = DataLoader(ds_tr, batch_size=batch_size, shuffle=True, num_workers=num_workers, pin_memory=pin)
+    dl_va = DataLoader(ds_va, batch_size=batch_size, shuffle=False, num_workers=num_workers, pin_memory=pin)
+    dl_te = DataLoader(ds_te, batch_size=batch_size, shuffle=False, num_workers=num_workers, pin_memory=pin)
     return dl_tr, dl_va, dl_te, ds_tr.label2id
\ No newline at end of file
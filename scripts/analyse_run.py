@@ -113,7 +113,7 @@ def collect_test_predictions(run_dir: Path,
     if not ckpt_path.exists():
         raise FileNotFoundError(f"Cannot find checkpoint at {ckpt_path}")
 
-    backbone = TinyAudioCNN()
+    backbone = TinyAudioCNN.from_run_dir(run_dir)
     model = ExitNet(backbone, tap_dims=(16, 32), final_dim=64, num_classes=num_classes).to(device)
     state_dict = torch.load(ckpt_path, map_location=device)
     model.load_state_dict(state_dict)
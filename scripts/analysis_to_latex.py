@@ -3,19 +3,57 @@ import argparse
 from pathlib import Path
 import csv
 
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Prefer a C JSON parser when one is installed; both accept bytes.
+try:
+    import orjson as _fast_json
+except ImportError:
+    try:
+        import ujson as _fast_json
+    except ImportError:
+        _fast_json = None
+
 
 def load_json(path, default=None):
     """Safe JSON loader with optional default."""
     p = Path(path)
     if not p.exists():
         return default
-    with open(p, "r", encoding="utf-8") as f:
-        return json.load(f)
+    data = p.read_bytes()
+    if _fast_json is not None:
+        try:
+            return _fast_json.loads(data)
+        except ValueError:
+            # Strict parsers reject the NaN / Infinity literals json.dump
+            # writes by default (e.g. a single-class ROC AUC in
+            # analysis_run.json); the stdlib parser accepts them.
+            pass
+    return json.loads(data)
 
 
-def make_latex_table(classification_per_exit, run_label="ASHADIP_V0 run", label_names=None):
+AGGREGATE_KEYS = ["accuracy", "macro avg", "weighted avg"]
+
+
+def sort_class_keys(class_keys):
+    """
+    Sort class keys numerically ("2" before "10") if they are all integers,
+    otherwise as plain strings.
     """
-    Build a LaTeX table string from a classification_report-style dict per exit.
+    try:
+        return sorted(class_keys, key=int)
+    except ValueError:
+        return sorted(class_keys)
+
+
+def make_latex_lines(classification_per_exit, run_label="ASHADIP_V0 run", label_names=None):
+    """
+    Build the lines of a LaTeX table from a classification_report-style dict per exit.
 
     Structure expected (per exit):
       {
@@ -48,14 +86,10 @@ def make_latex_table(classification_per_exit, run_label="ASHADIP_V0 run", label_
         lines.append(r"    \midrule")
 
         # Identify class keys vs aggregate keys
-        aggregate_keys = {"accuracy", "macro avg", "weighted avg"}
-        class_keys = [k for k in exit_dict.keys() if k not in aggregate_keys]
+        class_keys = [k for k in exit_dict.keys() if k not in AGGREGATE_KEYS]
 
         # Sort class keys so rows are deterministic
-        try:
-            class_keys = sorted(class_keys, key=lambda x: int(x))
-        except ValueError:
-            class_keys = sorted(class_keys)
+        class_keys = sort_class_keys(class_keys)
 
         # Per-class rows
         for cls in class_keys:
@@ -113,7 +147,12 @@ def make_latex_table(classification_per_exit, run_label="ASHADIP_V0 run", label_
     lines.append(r"  \end{tabular}")
     lines.append(r"\end{table}")
 
-    return "\n".join(lines)
+    return lines
+
+
+def make_latex_table(classification_per_exit, run_label="ASHADIP_V0 run", label_names=None):
+    """Same as make_latex_lines, joined into a single string."""
+    return "\n".join(make_latex_lines(classification_per_exit, run_label, label_names))
 
 
 def write_csv_and_txt(classification_per_exit, out_tex_path: Path, label_names=None):
@@ -123,6 +162,7 @@ def write_csv_and_txt(classification_per_exit, out_tex_path: Path, label_names=N
 
       - <basename>.csv
       - <basename>.txt
+      - <basename>.parquet  (unformatted numeric metrics; only if pyarrow is installed)
 
     Columns:
       exit, class, type, precision, recall, f1, support
@@ -131,20 +171,17 @@ def write_csv_and_txt(classification_per_exit, out_tex_path: Path, label_names=N
     """
     csv_path = out_tex_path.with_suffix(".csv")
     txt_path = out_tex_path.with_suffix(".txt")
+    parquet_path = out_tex_path.with_suffix(".parquet")
 
     rows = []
+    records = []  # same rows with unformatted metrics (None if absent), for Parquet
     header = ["exit", "class", "type", "precision", "recall", "f1", "support"]
 
     for exit_name in sorted(classification_per_exit.keys()):
         exit_dict = classification_per_exit[exit_name]
 
-        aggregate_keys = {"accuracy", "macro avg", "weighted avg"}
-        class_keys = [k for k in exit_dict.keys() if k not in aggregate_keys]
-
-        try:
-            class_keys = sorted(class_keys, key=lambda x: int(x))
-        except ValueError:
-            class_keys = sorted(class_keys)
+        class_keys = [k for k in exit_dict.keys() if k not in AGGREGATE_KEYS]
+        class_keys = sort_class_keys(class_keys)
 
         # Class rows
         for cls in class_keys:
@@ -172,6 +209,7 @@ def write_csv_and_txt(classification_per_exit, out_tex_path: Path, label_names=N
                 f"{f1:.6f}" if f1 is not None else "",
                 int(sup) if sup is not None else ""
             ])
+            records.append([exit_name, cls_name, "class", prec, rec, f1, sup])
 
         # Accuracy
         if "accuracy" in exit_dict:
@@ -182,6 +220,7 @@ def write_csv_and_txt(classification_per_exit, out_tex_path: Path, label_names=N
                 "accuracy",
                 "", "", f"{acc:.6f}", ""
             ])
+            records.append([exit_name, "", "accuracy", None, None, acc, None])
 
         # Macro / weighted averages
         for agg_key in ["macro avg", "weighted avg"]:
@@ -201,6 +240,7 @@ def write_csv_and_txt(classification_per_exit, out_tex_path: Path, label_names=N
                     f"{f1:.6f}" if f1 is not None else "",
                     int(sup) if sup is not None else ""
                 ])
+                records.append([exit_name, "", agg_key, prec, rec, f1, sup])
 
     # Write CSV
     with open(csv_path, "w", encoding="utf-8", newline="") as f:
@@ -217,6 +257,16 @@ def write_csv_and_txt(classification_per_exit, out_tex_path: Path, label_names=N
     print(f"[analysis_to_latex] Wrote CSV to {csv_path} with {len(rows)} rows")
     print(f"[analysis_to_latex] Wrote TXT to {txt_path} with {len(rows)} rows")
 
+    # Write Parquet (typed columns, compressed; cheaper to reload than the CSV)
+    if pa is None:
+        print("[analysis_to_latex] pyarrow not installed; skipping Parquet output")
+        return
+    df = pd.DataFrame(records, columns=header)
+    for col in ["precision", "recall", "f1", "support"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df.to_parquet(parquet_path, index=False, compression="zstd")
+    print(f"[analysis_to_latex] Wrote Parquet to {parquet_path} with {len(df)} rows")
+
 
 def main():
     ap = argparse.ArgumentParser()
@@ -262,9 +312,9 @@ def main():
         print(f"[analysis_to_latex] Using classification_per_exit from {analysis_path}")
 
     # 1) LaTeX table
-    table_str = make_latex_table(cls, run_label=args.run_label, label_names=label_names)
+    lines = make_latex_lines(cls, run_label=args.run_label, label_names=label_names)
     with open(out_tex_path, "w", encoding="utf-8") as f:
-        f.write(table_str + "\n")
+        f.writelines(line + "\n" for line in lines)
     print(f"[analysis_to_latex] Wrote LaTeX table to {out_tex_path}")
 
     # 2) CSV + TXT backups
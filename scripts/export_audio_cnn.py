@@ -0,0 +1,131 @@
+import argparse
+from pathlib import Path
+
+import torch
+
+from adapters.audio_adapter import TinyAudioCNN
+from models.exit_net import ExitNet
+
+
+def export_onnx(backbone, onnx_path: Path, n_mels=64, frames=101, opset=17):
+    """
+    Export a trained TinyAudioCNN backbone to ONNX.
+
+    Batch (B) and time (T) axes are dynamic, so the same graph serves any
+    batch size / segment length. The model MUST be in eval mode, otherwise
+    BatchNorm is exported with training-mode batch statistics.
+
+    Uses the TorchScript-based exporter (dynamo=False, torch>=2.5) so the
+    graph is emitted at exactly the requested opset; the dynamo exporter
+    only implements opset>=18 and silently falls back to it.
+
+    Graph outputs: final_feat (B,64), t1 (B,16), t2 (B,32).
+    """
+    backbone = backbone.eval().cpu()
+    dummy = torch.randn(1, 1, n_mels, frames)
+    torch.onnx.export(
+        backbone,
+        dummy,
+        str(onnx_path),
+        input_names=["x"],
+        output_names=["final_feat", "t1", "t2"],
+        dynamic_axes={
+            "x": {0: "B", 3: "T"},
+            "final_feat": {0: "B"},
+            "t1": {0: "B"},
+            "t2": {0: "B"},
+        },
+        opset_version=opset,
+        do_constant_folding=True,
+        dynamo=False,
+    )
+
+
+def build_trt_engine(onnx_path: Path, engine_path: Path, n_mels=64, frames=101,
+                     max_batch=64, fp16=True):
+    """
+    Build a serialized TensorRT engine from the exported ONNX file.
+
+    Requires the `tensorrt` Python package (NVIDIA GPU only). The optimisation
+    profile covers batch sizes 1..max_batch at a fixed number of frames.
+    """
+    import tensorrt as trt
+
+    logger = trt.Logger(trt.Logger.WARNING)
+    builder = trt.Builder(logger)
+    network = builder.create_network(
+        1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH)
+    )
+    parser = trt.OnnxParser(network, logger)
+    with open(onnx_path, "rb") as f:
+        if not parser.parse(f.read()):
+            errors = [str(parser.get_error(i)) for i in range(parser.num_errors)]
+            raise SystemExit("TensorRT failed to parse ONNX:\n" + "\n".join(errors))
+
+    config = builder.create_builder_config()
+    if fp16:
+        config.set_flag(trt.BuilderFlag.FP16)
+
+    profile = builder.create_optimization_profile()
+    profile.set_shape(
+        "x",
+        (1, 1, n_mels, frames),
+        (max_batch, 1, n_mels, frames),
+        (max_batch, 1, n_mels, frames),
+    )
+    config.add_optimization_profile(profile)
+
+    engine_bytes = builder.build_serialized_network(network, config)
+    if engine_bytes is None:
+        raise SystemExit("TensorRT engine build failed.")
+    with open(engine_path, "wb") as f:
+        f.write(engine_bytes)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--run_dir", required=True,
+                    help="Run directory containing ckpt/best.pt")
+    ap.add_argument("--num_classes", type=int, default=2)
+    ap.add_argument("--n_mels", type=int, default=None,
+                    help="Mel bins of the dummy input (default: the run's backbone.json, else 64).")
+    ap.add_argument("--frames", type=int, default=101,
+                    help="Frames of the dummy input (T is exported as dynamic).")
+    ap.add_argument("--opset", type=int, default=17)
+    ap.add_argument("--out", default=None,
+                    help="Output .onnx path (default: <run_dir>/ckpt/backbone.onnx)")
+    ap.add_argument("--trt", action="store_true",
+                    help="Also build a TensorRT engine (<out>.engine), FP16 by default.")
+    ap.add_argument("--trt_fp32", action="store_true",
+                    help="Build the TensorRT engine in FP32 instead of FP16.")
+    ap.add_argument("--max_batch", type=int, default=64)
+    args = ap.parse_args()
+
+    run_dir = Path(args.run_dir)
+    ckpt_path = run_dir / "ckpt" / "best.pt"
+    if not ckpt_path.exists():
+        raise SystemExit(f"Checkpoint not found: {ckpt_path}")
+
+    onnx_path = Path(args.out) if args.out else run_dir / "ckpt" / "backbone.onnx"
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Load the full ExitNet checkpoint, then export only the backbone.
+    model = ExitNet(TinyAudioCNN.from_run_dir(run_dir), tap_dims=(16, 32), final_dim=64,
+                    num_classes=args.num_classes)
+    model.load_state_dict(torch.load(ckpt_path, map_location="cpu"))
+    model.eval()
+    n_mels = args.n_mels or model.backbone.n_mels
+
+    export_onnx(model.backbone, onnx_path, n_mels=n_mels, frames=args.frames,
+                opset=args.opset)
+    print(f"[export_audio_cnn] Wrote ONNX backbone to {onnx_path}")
+
+    if args.trt:
+        engine_path = onnx_path.with_suffix(".engine")
+        build_trt_engine(onnx_path, engine_path, n_mels=n_mels, frames=args.frames,
+                         max_batch=args.max_batch, fp16=not args.trt_fp32)
+        print(f"[export_audio_cnn] Wrote TensorRT engine to {engine_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,22 +14,23 @@ def make_latex_table(df: pd.DataFrame) -> str:
       - lat_exit2_ms_mean
       - lat_exit3_ms_mean
       - compute_saving_pct_mean
-    Index: variant, device
+    Index: variant, device, backend, fuse_bn, precision
     """
     lines = []
     lines.append(r"\begin{table}[ht]")
     lines.append(r"  \centering")
     lines.append(r"  \caption{Average on-device latency per ASHADIP variant (per-exit).}")
     lines.append(r"  \label{tab:on_device_performance}")
-    lines.append(r"  \begin{tabular}{llrrrr}")
+    lines.append(r"  \begin{tabular}{lllrrrr}")
     lines.append(r"    \toprule")
     lines.append(
-        r"    Variant & Device & Runs & Exit1 (ms) & Exit2 (ms) & Exit3 (ms) \\"
+        r"    Variant & Device & Backend & Runs & Exit1 (ms) & Exit2 (ms) & Exit3 (ms) \\"
     )
     lines.append(r"    \midrule")
 
-    for (variant, device), row in df.iterrows():
+    for (variant, device, backend, fuse_bn, precision), row in df.iterrows():
         n_runs = int(row.get("n_runs", 1))
+        config = f"{backend}{'+BN fold' if fuse_bn else ''} {precision}"
 
         def fmt_ms(x):
             if pd.isna(x):
@@ -44,7 +45,7 @@ def make_latex_table(df: pd.DataFrame) -> str:
         e3 = fmt_ms(row.get("lat_exit3_ms_mean"))
 
         lines.append(
-            rf"    {variant} & {device} & {n_runs} & {e1} & {e2} & {e3} \\"
+            rf"    {variant} & {device} & {config} & {n_runs} & {e1} & {e2} & {e3} \\"
         )
 
     lines.append(r"    \bottomrule")
@@ -99,8 +100,18 @@ def main():
                 f"No rows left after filtering for device='{args.device_filter}'."
             )
 
-    # Group by variant + device
-    grouped = df_runs.groupby(["variant", "device"])
+    # Backend / precision columns (profile_latency.py --onnx/--script/--fuse_bn/--amp);
+    # rows from before they were recorded are eager fp32 runs.
+    config_defaults = {"backend": "eager", "fuse_bn": False, "precision": "fp32"}
+    for col, default in config_defaults.items():
+        if col not in df_runs.columns:
+            df_runs[col] = default
+        else:
+            df_runs[col] = df_runs[col].fillna(default)
+
+    # Group by variant + device + config, so e.g. fp16 or ORT latencies are
+    # never averaged into the eager fp32 numbers
+    grouped = df_runs.groupby(["variant", "device", *config_defaults])
 
     agg_df = grouped.agg(
         n_runs=("run_id", "count"),
@@ -10,7 +10,7 @@ def main(run_dir, segments_csv, features_root):
     temps = [max(float(t), 0.5) for t in temps]  # stability
 
     device = "cuda" if torch.cuda.is_available() else "cpu"
-    model = ExitNet(TinyAudioCNN(), (16,32), 64, 2).to(device)
+    model = ExitNet(TinyAudioCNN.from_run_dir(run_dir), (16,32), 64, 2).to(device)
     model.load_state_dict(torch.load(os.path.join(run_dir, "ckpt", "best.pt"), map_location=device))
     model.eval()
 
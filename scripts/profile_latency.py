@@ -1,4 +1,5 @@
 import os
+import csv
 import json
 import argparse
 from pathlib import Path
@@ -7,7 +8,7 @@ import numpy as np
 import torch
 
 from data.datasets import make_loaders
-from adapters.audio_adapter import TinyAudioCNN
+from adapters.audio_adapter import TinyAudioCNN, OrtTinyAudioCNN
 from models.exit_net import ExitNet
 from utils.profiling import measure_latency_ms, estimate_flops_tiny_audiocnn
 
@@ -45,6 +46,45 @@ def infer_feature_shape(segments_csv, features_root):
     return int(n_mels), int(frames)
 
 
+# Config columns of on_device_summary.csv. Rows appended before these
+# columns existed were all plain eager fp32 runs.
+CONFIG_DEFAULTS = {"backend": "eager", "fuse_bn": False, "precision": "fp32"}
+
+
+def append_summary_row(csv_path, row):
+    """
+    Append one row to on_device_summary.csv. If the existing header lacks
+    some of row's columns (e.g. a file written before backend / precision
+    were recorded), the file is rewritten with the new header first: old
+    rows get CONFIG_DEFAULTS for the config columns, other new columns are
+    left empty.
+    """
+    fieldnames = list(row.keys())
+    header = []
+    if csv_path.exists():
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+
+    if set(fieldnames) <= set(header):
+        fieldnames = header
+    elif header:
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            old_rows = list(csv.DictReader(f))
+        # Keep any columns this version no longer writes
+        fieldnames += [c for c in header if c not in fieldnames]
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for old in old_rows:
+                writer.writerow({**CONFIG_DEFAULTS, **old})
+
+    with open(csv_path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        if not header:
+            writer.writeheader()
+        writer.writerow(row)
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--run_dir", required=True,
@@ -59,8 +99,30 @@ def main():
                     help="Batch size used for latency measurement.")
     ap.add_argument("--n_warm", type=int, default=5)
     ap.add_argument("--n_iter", type=int, default=20)
+    ap.add_argument("--fuse_bn", action="store_true",
+                    help="Fold BatchNorm into the backbone convs before timing.")
+    ap.add_argument("--amp", default="none", choices=["none", "fp16", "bf16"],
+                    help="Run the forward under autocast (fp16 on cuda, bf16 on cpu/cuda).")
+    ap.add_argument("--script", action="store_true",
+                    help="Run a frozen TorchScript copy of the backbone.")
+    ap.add_argument("--onnx", default=None,
+                    help="Run the backbone from this ONNX file via ONNX Runtime "
+                         "(see scripts/export_audio_cnn.py).")
     args = ap.parse_args()
 
+    # ORT runs the exported graph as-is: autocast, BN folding and scripting
+    # would not apply, yet the row would be labelled with them.
+    if args.onnx and (args.amp != "none" or args.fuse_bn or args.script):
+        ap.error("--onnx cannot be combined with --amp, --fuse_bn or --script")
+
+    if args.onnx:
+        backend = "onnxruntime"
+    elif args.script:
+        backend = "torchscript"
+    else:
+        backend = "eager"
+    precision = "fp32" if args.amp == "none" else args.amp
+
     run_dir = Path(args.run_dir)
     if not run_dir.exists():
         raise SystemExit(f"run_dir not found: {run_dir}")
@@ -86,10 +148,17 @@ def main():
     if not ckpt_path.exists():
         raise SystemExit(f"Checkpoint not found: {ckpt_path}")
 
-    backbone = TinyAudioCNN()
+    backbone = TinyAudioCNN.from_run_dir(run_dir)
     model = ExitNet(backbone, tap_dims=(16, 32), final_dim=64, num_classes=num_classes).to(device)
     state = torch.load(ckpt_path, map_location=device)
     model.load_state_dict(state)
+    model.eval()
+    if args.fuse_bn:
+        model.backbone.eval_fuse()
+    if args.script:
+        model.backbone = model.backbone.to_scripted()
+    if args.onnx:
+        model.backbone = OrtTinyAudioCNN(args.onnx, device=device)
 
     # --- Measure latency for "full" forward (all exits) ---
     latency_full_ms = measure_latency_ms(
@@ -98,6 +167,7 @@ def main():
         n_warm=args.n_warm,
         n_iter=args.n_iter,
         device=device,
+        amp_dtype={"fp16": torch.float16, "bf16": torch.bfloat16}.get(args.amp),
     )
 
     # --- Estimate FLOPs per exit to approximate per-exit latency ---
@@ -106,6 +176,7 @@ def main():
         n_mels=n_mels,
         frames=frames,
         num_classes=num_classes,
+        strided_blocks=backbone.strided_blocks,
     )
     fl1 = float(flops["exit1"])
     fl2 = float(flops["exit2"])
@@ -136,6 +207,9 @@ def main():
         "run_id": run_dir.name,
         "device": device,
         "batch_size": batch_size,
+        "backend": backend,
+        "fuse_bn": args.fuse_bn,
+        "precision": precision,
         "latency_ms": {
             "exit1": lat_exit1_ms,
             "exit2": lat_exit2_ms,
@@ -163,6 +237,9 @@ def main():
         "run_id": profiling["run_id"],
         "device": profiling["device"],
         "batch_size": profiling["batch_size"],
+        "backend": profiling["backend"],
+        "fuse_bn": profiling["fuse_bn"],
+        "precision": profiling["precision"],
         "lat_exit1_ms": profiling["latency_ms"]["exit1"],
         "lat_exit2_ms": profiling["latency_ms"]["exit2"],
         "lat_exit3_ms": profiling["latency_ms"]["exit3"],
@@ -174,13 +251,7 @@ def main():
         "compute_saving_pct": compute_saving_pct,
     }
 
-    write_header = not csv_path.exists()
-    import csv
-    with open(csv_path, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=list(row.keys()))
-        if write_header:
-            writer.writeheader()
-        writer.writerow(row)
+    append_summary_row(csv_path, row)
 
     print(f"[profile_latency] Appended row to {csv_path}")
 
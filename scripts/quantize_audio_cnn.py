@@ -0,0 +1,104 @@
+import copy
+import argparse
+from pathlib import Path
+
+import torch
+from torch.ao.quantization import QConfigMapping, get_default_qconfig
+from torch.ao.quantization.quantize_fx import convert_fx, fuse_fx, prepare_fx
+
+from data.datasets import make_loaders
+from adapters.audio_adapter import TinyAudioCNN
+from models.exit_net import ExitNet
+
+
+@torch.no_grad()
+def calibrate(prepared, dl, n_batches=20):
+    """Run a few batches through the observed model to collect activation ranges."""
+    for i, (x, _) in enumerate(dl):
+        if i >= n_batches:
+            break
+        prepared(x)
+
+
+def quantize_int8(model, dl_calib, n_batches=20, backend="x86"):
+    """
+    Post-training static INT8 quantization of an ExitNet (backbone + heads)
+    with the FX graph mode flow:
+
+      fuse_fx (Conv+BN+ReLU) -> prepare_fx (observers) -> calibrate -> convert_fx
+
+    Convs/Linears run as int8 kernels (FBGEMM / oneDNN on x86). The tap
+    pooling (_tap_pool) stays in float between dequant/quant stubs.
+    """
+    torch.backends.quantized.engine = backend
+    model = copy.deepcopy(model).cpu().eval()
+
+    example_x, _ = next(iter(dl_calib))
+    qconfig_mapping = QConfigMapping().set_global(get_default_qconfig(backend))
+
+    fused = fuse_fx(model)
+    prepared = prepare_fx(fused, qconfig_mapping, example_inputs=(example_x,))
+    calibrate(prepared, dl_calib, n_batches=n_batches)
+    return convert_fx(prepared)
+
+
+@torch.no_grad()
+def exit_accuracy(model, dl):
+    """Test accuracy of each exit (list of 3 floats)."""
+    correct = [0, 0, 0]
+    n = 0
+    for x, y in dl:
+        logits = model(x)
+        n += x.size(0)
+        for k, lg in enumerate(logits):
+            correct[k] += int((lg.argmax(1) == y).sum())
+    return [c / max(n, 1) for c in correct]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--run_dir", required=True,
+                    help="Run directory containing ckpt/best.pt")
+    ap.add_argument("--segments_csv", default="data_cache/segments.csv")
+    ap.add_argument("--features_root", default="data_cache/features")
+    ap.add_argument("--batch_size", type=int, default=64)
+    ap.add_argument("--calib_batches", type=int, default=20,
+                    help="Number of validation batches used for calibration.")
+    ap.add_argument("--backend", default="x86", choices=["x86", "fbgemm", "qnnpack"])
+    ap.add_argument("--out", default=None,
+                    help="Output TorchScript file (default: <run_dir>/ckpt/best_int8.pt)")
+    args = ap.parse_args()
+
+    run_dir = Path(args.run_dir)
+    ckpt_path = run_dir / "ckpt" / "best.pt"
+    if not ckpt_path.exists():
+        raise SystemExit(f"Checkpoint not found: {ckpt_path}")
+    out_path = Path(args.out) if args.out else run_dir / "ckpt" / "best_int8.pt"
+
+    # Held-out VAL split for calibration, TEST split for the accuracy check
+    _, dl_va, dl_te, label2id = make_loaders(
+        args.segments_csv,
+        args.features_root,
+        batch_size=args.batch_size,
+        num_workers=2,
+    )
+
+    model = ExitNet(TinyAudioCNN.from_run_dir(run_dir), tap_dims=(16, 32), final_dim=64, num_classes=len(label2id))
+    model.load_state_dict(torch.load(ckpt_path, map_location="cpu"))
+    model.eval()
+
+    qmodel = quantize_int8(model, dl_va, n_batches=args.calib_batches, backend=args.backend)
+
+    acc_fp32 = exit_accuracy(model, dl_te)
+    acc_int8 = exit_accuracy(qmodel, dl_te)
+    print(f"[quantize_audio_cnn] Test acc@exits fp32={acc_fp32}")
+    print(f"[quantize_audio_cnn] Test acc@exits int8={acc_int8}")
+
+    # TorchScript keeps the quantized graph loadable without this code:
+    #   torch.backends.quantized.engine = "x86"; m = torch.jit.load(path)
+    torch.jit.save(torch.jit.script(qmodel), str(out_path))
+    print(f"[quantize_audio_cnn] Saved INT8 model to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -104,7 +104,7 @@ def policy_eval(run_dir, segments_csv, features_root, save_plots=True):
     device = "cuda" if torch.cuda.is_available() else "cpu"
     dl_tr, dl_va, dl_te, label2id = make_loaders(segments_csv, features_root, batch_size=64, num_workers=2)
     num_classes = len(label2id)
-    model = ExitNet(TinyAudioCNN(), (16,32), 64, num_classes).to(device).eval()
+    model = ExitNet(TinyAudioCNN.from_run_dir(run_dir), (16,32), 64, num_classes).to(device).eval()
     model.load_state_dict(torch.load(os.path.join(run_dir,"ckpt","best.pt"), map_location=device))
 
     # Evaluate greedy early-exit on TEST
@@ -137,7 +137,8 @@ def policy_eval(run_dir, segments_csv, features_root, save_plots=True):
     n_mels, frames = np.load(feat_path).shape
 
     # FLOPs
-    fl = estimate_flops_tiny_audiocnn(n_mels=int(n_mels), frames=int(frames), num_classes=num_classes)
+    fl = estimate_flops_tiny_audiocnn(n_mels=int(n_mels), frames=int(frames), num_classes=num_classes,
+                                      strided_blocks=model.backbone.strided_blocks)
     full_mflops = fl["exit3"]/1e6
     expected_mflops = (p1*fl["exit1"] + p2*fl["exit2"] + p3*fl["exit3"])/1e6
     saving_pct = 100.0*(1.0 - expected_mflops/full_mflops)
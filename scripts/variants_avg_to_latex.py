@@ -1,12 +1,13 @@
 import argparse
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 
-def make_latex_table(df: pd.DataFrame) -> str:
+def make_latex_lines(df: pd.DataFrame) -> list:
     """
-    Build a LaTeX table summarising averaged performance per variant (+device).
+    Build the lines of a LaTeX table summarising averaged performance per variant (+device).
 
     Expected index: MultiIndex (variant, device) or single index variant.
     Expected columns (after aggregation):
@@ -33,51 +34,53 @@ def make_latex_table(df: pd.DataFrame) -> str:
     lines.append(r"    \midrule")
 
     # If df has a MultiIndex, reset it to explicit columns
-    if isinstance(df.index, pd.MultiIndex):
-        df_iter = df.reset_index()
-    else:
-        df_iter = df.reset_index()
-
-    for _, row in df_iter.iterrows():
-        variant = row.get("variant", "")
-        device  = row.get("device", "")
-
-        n_runs = int(row.get("n_runs", 1))
-
-        def f_pct01(x):
-            try:
-                return f"{float(x) * 100.0:.1f}"
-            except Exception:
-                return "--"
-
-        def f_pct(x):
-            try:
-                return f"{float(x):.1f}"
-            except Exception:
-                return "--"
-
-        def f_float1(x):
-            try:
-                return f"{float(x):.1f}"
-            except Exception:
-                return "--"
-
-        acc   = f_pct01(row.get("policy_acc_mean"))
-        save  = f_pct(row.get("compute_saving_pct_mean"))
-        e1    = f_pct01(row.get("exit_e1_mean"))
-        e2    = f_pct01(row.get("exit_e2_mean"))
-        e3    = f_pct01(row.get("exit_e3_mean"))
-        exp_f = f_float1(row.get("expected_mflops_mean"))
-
-        lines.append(
-            rf"    {variant} & {device} & {n_runs} & {acc} & {save} & {e1} & {e2} & {e3} & {exp_f} \\"
-        )
+    df_rows = df.reset_index()
+
+    def col(name):
+        # Numeric column; missing columns / unparsable values become NaN
+        if name not in df_rows.columns:
+            return pd.Series(np.nan, index=df_rows.index)
+        return pd.to_numeric(df_rows[name], errors="coerce")
+
+    def fmt1(values):
+        # One decimal place for the whole column; NaN -> "--"
+        values = values.to_numpy(dtype=float)
+        out = np.char.mod("%.1f", np.nan_to_num(values))
+        return pd.Series(np.where(np.isnan(values), "--", out), index=df_rows.index)
+
+    def text(name):
+        if name not in df_rows.columns:
+            return pd.Series("", index=df_rows.index)
+        return df_rows[name].astype(str)
+
+    cells = [
+        text("variant"),
+        text("device"),
+        col("n_runs").fillna(1).astype(int).astype(str),
+        fmt1(col("policy_acc_mean") * 100.0),
+        fmt1(col("compute_saving_pct_mean")),
+        fmt1(col("exit_e1_mean") * 100.0),
+        fmt1(col("exit_e2_mean") * 100.0),
+        fmt1(col("exit_e3_mean") * 100.0),
+        fmt1(col("expected_mflops_mean")),
+    ]
+
+    # Join the cells column-wise into finished table rows (no per-row loop)
+    rows = cells[0]
+    for c in cells[1:]:
+        rows = rows + " & " + c
+    lines.extend(("    " + rows + r" \\").tolist())
 
     lines.append(r"    \bottomrule")
     lines.append(r"  \end{tabular}")
     lines.append(r"\end{table}")
 
-    return "\n".join(lines)
+    return lines
+
+
+def make_latex_table(df: pd.DataFrame) -> str:
+    """Same as make_latex_lines, joined into a single string."""
+    return "\n".join(make_latex_lines(df))
 
 
 def main():
@@ -109,7 +112,23 @@ def main():
     out_csv_path = Path(args.out_csv)
     out_csv_path.parent.mkdir(parents=True, exist_ok=True)
 
-    df = pd.read_csv(summary_path)
+    # Only parse the columns used below (the summary CSV has many more).
+    wanted = [
+        "run_id", "variant", "device",
+        "policy_test_acc", "test_acc_policy",
+        "compute_saving_pct", "exit_e1", "exit_e2", "exit_e3",
+        "expected_mflops", "full_mflops",
+    ]
+    header = pd.read_csv(summary_path, nrows=0).columns
+    usecols = [c for c in wanted if c in header]
+
+    # The pyarrow engine parses in native code and projects usecols during
+    # the scan; fall back to the default C parser if pyarrow is missing.
+    try:
+        df = pd.read_csv(summary_path, usecols=usecols, engine="pyarrow",
+                         dtype_backend="pyarrow")
+    except ImportError:
+        df = pd.read_csv(summary_path, usecols=usecols)
     if df.empty:
         raise SystemExit(f"No rows in {summary_path}; nothing to summarise.")
 
@@ -133,6 +152,20 @@ def main():
     if missing:
         raise SystemExit(f"Missing columns in {summary_path}: {missing}")
 
+    # Coerce the metric columns to float64 up front, so the aggregation below
+    # is one numeric pass instead of falling back to object-dtype reductions
+    # when a column was read as strings (e.g. blanks or "None" in the CSV).
+    metric_cols = [
+        "policy_test_acc",
+        "compute_saving_pct",
+        "exit_e1",
+        "exit_e2",
+        "exit_e3",
+        "expected_mflops",
+        "full_mflops",
+    ]
+    df[metric_cols] = df[metric_cols].apply(pd.to_numeric, errors="coerce").astype("float64")
+
     grouped = df.groupby(["variant", "device"])
 
     agg_df = grouped.agg(
@@ -152,9 +185,9 @@ def main():
     print(f"[variants_avg_to_latex] Wrote averaged variants CSV to {out_csv_path}")
 
     # Save LaTeX
-    table_str = make_latex_table(agg_df)
+    lines = make_latex_lines(agg_df)
     with open(out_tex_path, "w", encoding="utf-8") as f:
-        f.write(table_str + "\n")
+        f.writelines(line + "\n" for line in lines)
     print(f"[variants_avg_to_latex] Wrote LaTeX table to {out_tex_path}")
 
 
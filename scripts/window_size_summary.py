@@ -159,6 +159,14 @@ def main():
     if missing_pipe:
         raise SystemExit(f"Missing columns in {pipe_path}: {missing_pipe}")
 
+    # Only the plain eager fp32 latencies: profile_latency.py may log several
+    # backend / precision configs per run (rows from before these columns
+    # existed are all eager fp32)
+    on_config = {"backend": "eager", "fuse_bn": False, "precision": "fp32"}
+    for col, value in on_config.items():
+        if col in df_on.columns:
+            df_on = df_on[df_on[col].fillna(value) == value]
+
     # Join on run_id (each run_id is unique across logs)
     df_merged = (
         df_all.merge(df_on[["run_id", "lat_exit1_ms", "lat_exit2_ms", "lat_exit3_ms"]],
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Tests import project modules the same way the scripts do (adapters.*, scripts.*),
+# so put the repository root on sys.path.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
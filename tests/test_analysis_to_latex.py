@@ -0,0 +1,100 @@
+import csv
+import json
+import math
+
+import pytest
+
+from scripts.analysis_to_latex import load_json, make_latex_table, sort_class_keys, write_csv_and_txt
+
+
+def _report(class_keys):
+    rep = {k: {"precision": 0.5, "recall": 0.25, "f1-score": 0.125, "support": 4} for k in class_keys}
+    rep["accuracy"] = 0.75
+    rep["macro avg"] = {"precision": 0.5, "recall": 0.5, "f1-score": 0.5, "support": 8}
+    rep["weighted avg"] = {"precision": 0.6, "recall": 0.6, "f1-score": 0.6, "support": 8}
+    return rep
+
+
+def _read_csv(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_load_json_accepts_nan(tmp_path):
+    # analyse_run.py writes NaN for the ROC AUC of a single-class split
+    p = tmp_path / "analysis_run.json"
+    with open(p, "w", encoding="utf-8") as f:
+        json.dump({"roc_auc": {"exit1": {"auc": float("nan")}}, "label_names": ["a"]}, f)
+
+    data = load_json(p)
+    assert math.isnan(data["roc_auc"]["exit1"]["auc"])
+    assert data["label_names"] == ["a"]
+    assert load_json(tmp_path / "missing.json", default={}) == {}
+
+
+def test_write_csv_and_txt_rows(tmp_path):
+    cls = {
+        "exit.2": _report(["10", "2", "0"]),
+        "exit1": _report(["b.x", "a"]),
+    }
+    out_tex = tmp_path / "table.tex"
+    write_csv_and_txt(cls, out_tex)
+
+    rows = _read_csv(out_tex.with_suffix(".csv"))
+    assert rows[0] == ["exit", "class", "type", "precision", "recall", "f1", "support"]
+    # Per exit: classes (numeric order if all integers), then the aggregates
+    assert [r[:3] for r in rows[1:]] == [
+        ["exit.2", "0", "class"], ["exit.2", "2", "class"], ["exit.2", "10", "class"],
+        ["exit.2", "", "accuracy"], ["exit.2", "", "macro avg"], ["exit.2", "", "weighted avg"],
+        ["exit1", "a", "class"], ["exit1", "b.x", "class"],
+        ["exit1", "", "accuracy"], ["exit1", "", "macro avg"], ["exit1", "", "weighted avg"],
+    ]
+    assert rows[1][3:] == ["0.500000", "0.250000", "0.125000", "4"]
+    assert rows[4][3:] == ["", "", "0.750000", ""]
+    assert out_tex.with_suffix(".csv").read_bytes().startswith(b"exit,class,type,precision,recall,f1,support\r\n")
+
+    txt = out_tex.with_suffix(".txt").read_text(encoding="utf-8").splitlines()
+    assert [line.split("\t") for line in txt] == rows
+
+
+def test_write_csv_and_txt_label_names(tmp_path):
+    out_tex = tmp_path / "table.tex"
+    write_csv_and_txt({"exit1": _report(["1", "0", "7"])}, out_tex, label_names=["bird", "bat"])
+    rows = _read_csv(out_tex.with_suffix(".csv"))
+    assert [r[1] for r in rows[1:4]] == ["bird", "bat", "7"]
+
+
+def test_sort_class_keys():
+    assert sort_class_keys(["10", "2", "1"]) == ["1", "2", "10"]
+    assert sort_class_keys(["b", "10", "a", "2"]) == ["10", "2", "a", "b"]
+    big = str(2**70)
+    assert sort_class_keys([big, "3", "-1"]) == ["-1", "3", big]
+    assert sort_class_keys([10, 2, 1]) == [1, 2, 10]
+    assert sort_class_keys([]) == []
+
+
+def test_int_class_keys(tmp_path):
+    # A report dict built in Python (not loaded from JSON) has int keys
+    cls = {"exit1": _report([1, 0])}
+    table = make_latex_table(cls, label_names=["bird", "bat"])
+    assert table.index("bird &") < table.index("bat &")
+
+    out_tex = tmp_path / "table.tex"
+    write_csv_and_txt(cls, out_tex)
+    assert [r[1] for r in _read_csv(out_tex.with_suffix(".csv"))[1:3]] == ["0", "1"]
+
+
+def test_write_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    out_tex = tmp_path / "table.tex"
+    write_csv_and_txt({"exit1": _report(["1", "0"])}, out_tex)
+
+    df = pd.read_parquet(out_tex.with_suffix(".parquet"))
+    rows = _read_csv(out_tex.with_suffix(".csv"))
+    assert list(df.columns) == rows[0]
+    assert df["type"].tolist() == [r[2] for r in rows[1:]]
+    assert df["f1"].tolist() == [0.125, 0.125, 0.75, 0.5, 0.6]
+    assert df["support"].tolist()[:2] == [4, 4]
+    assert df["precision"].isna().tolist() == [False, False, True, False, False]
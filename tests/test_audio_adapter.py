@@ -0,0 +1,181 @@
+import copy
+
+import pytest
+import torch
+
+from adapters.audio_adapter import OrtTinyAudioCNN, TinyAudioCNN, _tap_pool
+from utils.profiling import estimate_flops_tiny_audiocnn
+
+
+def _trained_like_model(**kwargs):
+    # Non-trivial BN stats / affine params, as after training
+    torch.manual_seed(0)
+    model = TinyAudioCNN(**kwargs)
+    for m in model.modules():
+        if isinstance(m, torch.nn.BatchNorm2d):
+            m.running_mean.uniform_(-0.5, 0.5)
+            m.running_var.uniform_(0.5, 2.0)
+            m.weight.data.uniform_(0.5, 1.5)
+            m.bias.data.uniform_(-0.2, 0.2)
+    return model.eval()
+
+
+def _assert_outputs_close(out, ref, **tol):
+    torch.testing.assert_close(out[0], ref[0], **tol)
+    assert len(out[1]) == len(ref[1])
+    for t, r in zip(out[1], ref[1]):
+        torch.testing.assert_close(t, r, **tol)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="needs CUDA")
+def test_stage_input_matches_direct_forward():
+    torch.manual_seed(0)
+    model = TinyAudioCNN().cuda().eval()
+    model.alloc_io(batch=4, n_mels=64, T_max=101)
+
+    # Alternates between the two slots, with full and trimmed batch / T
+    batches = [torch.randn(b, 1, 64, t) for b, t in [(4, 101), (3, 80), (4, 101), (2, 60)]]
+    with torch.no_grad():
+        for x in batches:
+            staged = model.stage_input(x)
+            assert staged.is_contiguous(memory_format=torch.channels_last)
+            out, (t1, t2) = model(staged)
+            ref, (r1, r2) = model(x.cuda())
+            torch.testing.assert_close(out, ref)
+            torch.testing.assert_close(t1, r1)
+            torch.testing.assert_close(t2, r2)
+
+
+def test_forward_fast_matches_forward_and_survives_deepcopy():
+    model = _trained_like_model()
+    x = torch.randn(2, 1, 64, 101)
+    with torch.no_grad():
+        ref = model(x)
+        model.compile_fast()
+        _assert_outputs_close(model.forward_fast(x), ref, rtol=1e-4, atol=1e-5)
+
+        # The compiled wrapper is not copied; the copy recompiles on demand
+        clone = copy.deepcopy(model)
+        assert "_compiled" not in clone.__dict__
+        _assert_outputs_close(clone.forward_fast(x), ref, rtol=1e-4, atol=1e-5)
+    assert set(clone.state_dict()) == set(model.state_dict())
+
+
+def test_backbone_config_round_trip(tmp_path):
+    ckpt = tmp_path / "ckpt"
+    ckpt.mkdir()
+    # Runs without backbone.json use the default architecture
+    assert TinyAudioCNN.from_run_dir(tmp_path).strided_blocks == ()
+
+    TinyAudioCNN(n_mels=40, strided_blocks=[2, 1]).save_config(ckpt)
+    model = TinyAudioCNN.from_run_dir(tmp_path)
+    assert (model.n_mels, model.strided_blocks) == (40, (2, 1))
+    assert not any(isinstance(m, torch.nn.MaxPool2d) for m in model.modules())
+
+    # Same output shapes as the pooled model
+    out, (t1, t2) = model(torch.randn(2, 1, 40, 101))
+    assert (out.shape, t1.shape, t2.shape) == ((2, 64), (2, 16), (2, 32))
+
+
+@pytest.mark.parametrize("strided_blocks", [[3], [0], [1, 4]])
+def test_strided_blocks_rejects_unknown_blocks(strided_blocks):
+    with pytest.raises(ValueError):
+        TinyAudioCNN(strided_blocks=strided_blocks)
+
+
+def test_estimate_flops_strided_blocks():
+    head = lambda ch: 2 * ch * 2  # Linear ch -> 2 classes
+    base = estimate_flops_tiny_audiocnn(n_mels=64, frames=100)
+    s1 = estimate_flops_tiny_audiocnn(n_mels=64, frames=100, strided_blocks=(1,))
+    s12 = estimate_flops_tiny_audiocnn(n_mels=64, frames=100, strided_blocks=(1, 2))
+
+    # A stride-2 conv computes a quarter of the outputs of the pooled conv;
+    # the downsampled sizes (and so all later layers) are the same.
+    conv1 = base["exit1"] - head(16)
+    conv2 = base["exit2"] - head(32) - conv1
+    assert s1["exit1"] - head(16) == conv1 // 4
+    assert s1["exit2"] - s1["exit1"] == base["exit2"] - base["exit1"]
+    assert s12["exit2"] - head(32) == conv1 // 4 + conv2 // 4
+    assert s12["exit3"] - s12["exit2"] == base["exit3"] - base["exit2"]
+
+
+def test_forward_batch_matches_per_clip_forward():
+    model = _trained_like_model()
+    # Mixed lengths, non-positive values like power_to_db(ref=max) features
+    specs = [-torch.rand(1, 64, t) * 80 for t in (101, 60, 101, 77, 60)]
+    with torch.no_grad():
+        out, (t1, t2) = model.forward_batch(specs, max_batch=2)
+        for i, s in enumerate(specs):
+            ref, (r1, r2) = model(s.unsqueeze(0))
+            torch.testing.assert_close(out[i:i + 1], ref)
+            torch.testing.assert_close(t1[i:i + 1], r1)
+            torch.testing.assert_close(t2[i:i + 1], r2)
+
+
+def test_forward_batch_rejects_empty_input():
+    with pytest.raises(ValueError):
+        TinyAudioCNN().eval().forward_batch([])
+
+
+@pytest.mark.parametrize("strided_blocks", [(), (1, 2)])
+def test_eval_fuse_matches_unfused(strided_blocks):
+    model = _trained_like_model(strided_blocks=strided_blocks)
+    x = torch.randn(2, 1, 64, 101)
+    with torch.no_grad():
+        ref = model(x)
+        fused = model.eval_fuse()
+        out = fused(x)
+    assert not any(isinstance(m, torch.nn.BatchNorm2d) for m in fused.modules())
+    _assert_outputs_close(out, ref, rtol=1e-4, atol=1e-5)
+
+
+def test_eval_fuse_requires_eval_mode():
+    with pytest.raises(RuntimeError):
+        TinyAudioCNN().train().eval_fuse()
+
+
+def test_to_scripted_matches_eager():
+    model = _trained_like_model()
+    scripted = model.to_scripted()
+    with torch.no_grad():
+        # Frozen graph still accepts other clip lengths
+        for T in (101, 57):
+            x = torch.randn(2, 1, 64, T)
+            _assert_outputs_close(scripted(x), model(x), rtol=1e-4, atol=1e-5)
+
+
+@pytest.mark.parametrize("channels_last", [False, True])
+def test_tap_pool_matches_max_then_mean(channels_last):
+    torch.manual_seed(0)
+    f = torch.randn(3, 16, 32, 51)
+    if channels_last:
+        f = f.contiguous(memory_format=torch.channels_last)
+    torch.testing.assert_close(_tap_pool(f), f.amax(dim=-1).mean(dim=-1))
+
+
+def test_infer_matches_forward_without_autograd():
+    model = _trained_like_model()
+    x = torch.randn(2, 1, 64, 101)
+    out = model.infer(x)
+    with torch.no_grad():
+        _assert_outputs_close(out, model(x))
+    assert out[0].is_inference() and not out[0].requires_grad
+
+
+@pytest.mark.parametrize("opset", [17, 18])
+def test_onnx_export_matches_eager(tmp_path, opset):
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from scripts.export_audio_cnn import export_onnx
+
+    model = _trained_like_model()
+    path = tmp_path / "backbone.onnx"
+    export_onnx(model, path, opset=opset)
+    assert onnx.load(str(path)).opset_import[0].version == opset
+
+    ort_backbone = OrtTinyAudioCNN(path)
+    with torch.no_grad():
+        # Dynamic batch and time axes
+        for B, T in ((2, 101), (3, 57)):
+            x = torch.randn(B, 1, 64, T)
+            _assert_outputs_close(ort_backbone(x), model(x), rtol=1e-4, atol=1e-5)
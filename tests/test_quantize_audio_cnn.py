@@ -0,0 +1,43 @@
+import pytest
+import torch
+
+from adapters.audio_adapter import TinyAudioCNN
+from models.exit_net import ExitNet
+from scripts.quantize_audio_cnn import exit_accuracy, quantize_int8
+
+pytestmark = pytest.mark.skipif(
+    "x86" not in torch.backends.quantized.supported_engines, reason="needs the x86 quantized engine"
+)
+
+
+def test_quantize_int8_close_to_fp32():
+    torch.manual_seed(0)
+    model = ExitNet(TinyAudioCNN(), num_classes=3).eval()
+    # Calibration batches shaped like power_to_db(ref=max) features
+    dl = [(-torch.rand(8, 1, 64, 101) * 80, torch.randint(0, 3, (8,))) for _ in range(4)]
+    state = {k: v.clone() for k, v in model.state_dict().items()}
+
+    qmodel = quantize_int8(model, dl, n_batches=4)
+
+    # The float model is left untouched (quantize_int8 works on a copy)
+    for k, v in model.state_dict().items():
+        torch.testing.assert_close(v, state[k])
+    # Conv+BN+ReLU of all three blocks and the three exit heads run in int8
+    mods = list(qmodel.modules())
+    assert sum(isinstance(m, torch.ao.nn.intrinsic.quantized.ConvReLU2d) for m in mods) == 3
+    assert sum(isinstance(m, torch.ao.nn.quantized.Linear) for m in mods) == 3
+
+    x = dl[0][0]
+    with torch.no_grad():
+        ref = model(x)
+        out = qmodel(x)
+        for o, r in zip(out, ref):
+            assert (o - r).abs().max() <= 0.1 * r.abs().max()
+
+        # Saved as TorchScript by the script
+        scripted = torch.jit.script(qmodel)
+        for o, s in zip(out, scripted(x)):
+            torch.testing.assert_close(s, o)
+
+    acc = exit_accuracy(qmodel, dl)
+    assert len(acc) == 3 and all(0.0 <= a <= 1.0 for a in acc)
@@ -0,0 +1,83 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts import variants_avg_to_latex
+from scripts.variants_avg_to_latex import make_latex_lines
+
+
+def _run_main(tmp_path, monkeypatch, csv_text):
+    summary = tmp_path / "all_runs_summary.csv"
+    summary.write_text(csv_text, encoding="utf-8")
+    out_tex = tmp_path / "table.tex"
+    out_csv = tmp_path / "table.csv"
+    monkeypatch.setattr(sys, "argv", [
+        "variants_avg_to_latex.py",
+        "--summary_csv", str(summary),
+        "--out_tex", str(out_tex),
+        "--out_csv", str(out_csv),
+    ])
+    variants_avg_to_latex.main()
+    return out_tex.read_text(encoding="utf-8"), pd.read_csv(out_csv)
+
+
+def test_make_latex_lines_rows():
+    agg = pd.DataFrame(
+        {
+            "n_runs": [2, 1],
+            "policy_acc_mean": [0.9, 0.95],
+            "compute_saving_pct_mean": [45.0, np.nan],
+            "exit_e1_mean": [0.375, 0.125],
+            "exit_e2_mean": [0.25, 0.375],
+            "exit_e3_mean": [0.375, 0.5],
+            "expected_mflops_mean": [12.5, np.nan],
+            "full_mflops_mean": [31.25, 31.25],
+        },
+        index=pd.MultiIndex.from_tuples([("v0", "cpu"), ("v1", "cuda")], names=["variant", "device"]),
+    )
+    lines = make_latex_lines(agg)
+    i = lines.index(r"    \midrule")
+    assert lines[i + 1:i + 3] == [
+        r"    v0 & cpu & 2 & 90.0 & 45.0 & 37.5 & 25.0 & 37.5 & 12.5 \\",
+        r"    v1 & cuda & 1 & 95.0 & -- & 12.5 & 37.5 & 50.0 & -- \\",
+    ]
+    assert lines[i + 3] == r"    \bottomrule"
+    assert lines[-1] == r"\end{table}"
+
+
+def test_main_coerces_blank_and_none_metrics(tmp_path, monkeypatch):
+    tex, agg = _run_main(tmp_path, monkeypatch, (
+        "run_id,variant,device,policy_test_acc,exit_e1,exit_e2,exit_e3,expected_mflops,full_mflops,compute_saving_pct\n"
+        "r1,v0,cpu,0.95,0.5,0.25,0.25,12.5,31.25,50.0\n"
+        "r2,v0,cpu,0.85,0.25,0.25,0.5,None,31.25,40.0\n"
+        "r3,v1,cuda,0.9,0.125,0.375,0.5,,31.25,\n"
+    ))
+    # "None" / blank are missing values: skipped by the mean, "--" in the table
+    assert agg["expected_mflops_mean"].tolist()[0] == 12.5
+    assert np.isnan(agg["expected_mflops_mean"].tolist()[1])
+    assert agg["compute_saving_pct_mean"].tolist()[0] == 45.0
+    assert r"    v0 & cpu & 2 & 90.0 & 45.0 & 37.5 & 25.0 & 37.5 & 12.5 \\" in tex
+    assert r"    v1 & cuda & 1 & 90.0 & -- & 12.5 & 37.5 & 50.0 & -- \\" in tex
+
+
+def test_main_reads_only_needed_columns(tmp_path, monkeypatch):
+    # Extra columns are skipped; test_acc_policy is the older accuracy name
+    _, agg = _run_main(tmp_path, monkeypatch, (
+        "run_id,variant,tau,notes,test_acc_policy,exit_e1,exit_e2,exit_e3,expected_mflops,full_mflops,compute_saving_pct,device\n"
+        "r1,v0,0.9,\"a, b\",0.5,0.5,0.25,0.25,12.5,31.25,50.0,cpu\n"
+    ))
+    assert agg.columns.tolist() == [
+        "variant", "device", "n_runs", "policy_acc_mean", "compute_saving_pct_mean",
+        "exit_e1_mean", "exit_e2_mean", "exit_e3_mean", "expected_mflops_mean", "full_mflops_mean",
+    ]
+    assert agg.loc[0, "policy_acc_mean"] == 0.5
+
+
+def test_main_reports_missing_columns(tmp_path, monkeypatch):
+    with pytest.raises(SystemExit, match="exit_e3"):
+        _run_main(tmp_path, monkeypatch, (
+            "run_id,variant,device,policy_test_acc,exit_e1,exit_e2,expected_mflops,full_mflops,compute_saving_pct\n"
+            "r1,v0,cpu,0.95,0.5,0.25,12.5,31.25,50.0\n"
+        ))
@@ -69,7 +69,7 @@ if __name__ == '__main__':
     _, dl_va, _, _ = make_loaders(args.segments_csv, args.features_root, batch_size=128, num_workers=2)
 
     # load model
-    model = ExitNet(TinyAudioCNN(), (16,32), 64, 2).to(device)
+    model = ExitNet(TinyAudioCNN.from_run_dir(args.run_dir), (16,32), 64, 2).to(device)
     model.load_state_dict(torch.load(os.path.join(args.run_dir,'ckpt','best.pt'), map_location=device))
 
     # collect logits once
@@ -5,11 +5,11 @@ from adapters.audio_adapter import TinyAudioCNN
 from models.exit_net import ExitNet
 
 
-@torch.no_grad()
+@torch.inference_mode()
 def main(run_dir, segments_csv, features_root, num_classes=2):
     device = 'cuda' if torch.cuda.is_available() else 'cpu'
     dl_tr, dl_va, dl_te, label2id = make_loaders(segments_csv, features_root, 64, 4)
-    model = ExitNet(TinyAudioCNN(), tap_dims=(16,32), final_dim=64, num_classes=num_classes).to(device)
+    model = ExitNet(TinyAudioCNN.from_run_dir(run_dir), tap_dims=(16,32), final_dim=64, num_classes=num_classes).to(device)
     model.load_state_dict(torch.load(os.path.join(run_dir,'ckpt','best.pt'), map_location=device))
     model.eval()
     y_true, y_pred = [], [[] for _ in range(3)]
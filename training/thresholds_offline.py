@@ -58,7 +58,7 @@ def main():
     _, dl_val, _, _ = make_loaders(args.segments_csv, args.features_root, batch_size=128, num_workers=2)
 
     # 2) Load model
-    model = ExitNet(TinyAudioCNN(), (16, 32), 64, 2).to(device)
+    model = ExitNet(TinyAudioCNN.from_run_dir(args.run_dir), (16, 32), 64, 2).to(device)
     model.load_state_dict(torch.load(os.path.join(args.run_dir, "ckpt", "best.pt"), map_location=device))
 
     # 3) Load temperatures if available (and clamp small T)
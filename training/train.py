@@ -75,8 +75,10 @@ def main():
 
     n_mels = int((cfg.get('features') or {}).get('n_mels', 64))
     num_classes = int((cfg.get('model') or {}).get('num_classes', 2))
+    strided_blocks = (cfg.get('model') or {}).get('strided_blocks') or []
 
-    backbone = TinyAudioCNN(n_mels=n_mels)
+    backbone = TinyAudioCNN(n_mels=n_mels, strided_blocks=strided_blocks)
+    backbone.save_config(os.path.join(run_dir, 'ckpt'))
     model = ExitNet(backbone, tap_dims=(16, 32), final_dim=64, num_classes=num_classes).to(device)
 
     opt = Adam(model.parameters(), lr=lr, weight_decay=wd)